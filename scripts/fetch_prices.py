@@ -3,14 +3,26 @@
 Fetch VM prices from Scaleway, AWS EC2, and OVHcloud for Paris region.
 Outputs: data/prices.json
 Creates: data/prices_baseline.json (only on first run; delete to reset)
+
+  --record [DIR]  also save the raw API responses as fixtures (see scripts/fixtures.py)
+  --replay [DIR]  fetch from recorded fixtures through a local stub; fully offline,
+                  and updated_at is pinned to the recording time so output is reproducible.
+                  Writes replay/data/prices.json (git-ignored scratch site, see
+                  build_dashboard.py --out-dir) instead of data/prices.json and never
+                  creates the baseline.
+  --output PATH   write the prices JSON somewhere else
 """
 
+import argparse
 import gzip
 import json
+import time
 import urllib.request
 import os
 from datetime import datetime, timezone
 
+import fixtures
+
 SCALEWAY_URL = "https://api.scaleway.com/instance/v1/zones/fr-par-1/products/servers"
 AWS_URL = (
     "https://b0.p.awsstatic.com/pricing/2.0/meteredUnitMaps/ec2/USD/current/"
@@ -18,14 +30,26 @@ AWS_URL = (
 )
 OVH_URL = "https://eu.api.ovh.com/1.0/order/catalog/public/cloud?ovhSubsidiary=FR"
 
+RECORDER = None  # fixtures.Recorder while --record is active
+REPLAY   = None  # original url -> local stub url while --replay is active
+
 
 def fetch_json(url):
-    req = urllib.request.Request(url, headers={
+    if REPLAY is not None:
+        if url not in REPLAY:
+            raise KeyError(f"no recorded fixture for {url}")
+        target = REPLAY[url]
+    else:
+        target = url
+    req = urllib.request.Request(target, headers={
         "User-Agent": "cloud-price-tracker/1.0",
         "Accept-Encoding": "gzip, deflate",
     })
+    start = time.monotonic()
     with urllib.request.urlopen(req, timeout=30) as resp:
         raw = resp.read()
+        if RECORDER:
+            RECORDER.save(url, raw, resp.headers, time.monotonic() - start)
         if raw[:2] == b'\x1f\x8b':
             raw = gzip.decompress(raw)
         return json.loads(raw)
@@ -105,7 +129,7 @@ def fetch_ovh():
     results = []
     seen_names = set()
 
-    for code in instance_addon_codes:
+    for code in sorted(instance_addon_codes):
         addon = addon_by_code.get(code)
         if not addon:
             continue
@@ -156,8 +180,69 @@ def fetch_ovh():
     return results
 
 
+PROVIDERS = {
+    "scaleway": ("Scaleway", "EUR", fetch_scaleway),
+    "aws":      ("AWS EC2",  "USD", fetch_aws),
+    "ovh":      ("OVHcloud", "EUR", fetch_ovh),
+}
+
+BASELINE_PATH = "data/prices_baseline.json"
+OUTPUT_PATH   = "data/prices.json"
+REPLAY_DIR    = "replay"  # scratch site root for replay runs; they must not clobber the tracked data
+REPLAY_OUTPUT = f"{REPLAY_DIR}/{OUTPUT_PATH}"
+
+
+def utc_now():
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def build_output(instances, updated_at=None):
+    """Wrap per-provider instance lists ({'scaleway': [...], ...}) in the prices.json layout."""
+    return {
+        "updated_at": updated_at or utc_now(),
+        "region": "Paris (fr-par)",
+        "providers": {
+            key: {"name": name, "currency": currency, "instances": instances[key]}
+            for key, (name, currency, _fetch) in PROVIDERS.items()
+        },
+    }
+
+
+def save_baseline_if_missing(output):
+    # Create baseline only if it does not already exist.
+    # To reset: delete data/prices_baseline.json and re-run.
+    if os.path.exists(BASELINE_PATH):
+        return False
+    baseline = {**output, "baseline_set_at": output["updated_at"]}
+    with open(BASELINE_PATH, "w") as f:
+        json.dump(baseline, f, indent=2)
+    return True
+
+
+def setup_fixtures(args):
+    """Apply --record/--replay from fixtures.add_arguments; returns the ReplayStub or None."""
+    global RECORDER, REPLAY
+    if args.record:
+        RECORDER = fixtures.Recorder(args.record)
+        print(f"Recording responses to {fixtures.version_dir(args.record)}")
+    if args.replay:
+        stub = fixtures.ReplayStub(args.replay, args.latency_scale)
+        REPLAY = stub.urls()
+        print(f"Replaying {len(REPLAY)} responses from {fixtures.version_dir(args.replay)}"
+              f" (recorded {stub.recorded_at}, latency x{args.latency_scale})")
+        return stub
+    return None
+
+
 def main():
-    os.makedirs("data", exist_ok=True)
+    parser = argparse.ArgumentParser(description="Fetch VM prices for the Paris region.")
+    fixtures.add_arguments(parser)
+    parser.add_argument("--output", metavar="PATH",
+                        help=f"where to write the prices JSON (default {OUTPUT_PATH}, {REPLAY_OUTPUT} with --replay)")
+    args = parser.parse_args()
+    stub = setup_fixtures(args)
+    out_path = args.output or (REPLAY_OUTPUT if stub else OUTPUT_PATH)
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
 
     print("Fetching Scaleway...")
     scaleway = fetch_scaleway()
@@ -171,31 +256,20 @@ def main():
     ovh = fetch_ovh()
     print(f"  -> {len(ovh)} instance types")
 
-    output = {
-        "updated_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
-        "region": "Paris (fr-par)",
-        "providers": {
-            "scaleway": {"name": "Scaleway", "currency": "EUR", "instances": scaleway},
-            "aws":      {"name": "AWS EC2",  "currency": "USD", "instances": aws},
-            "ovh":      {"name": "OVHcloud", "currency": "EUR", "instances": ovh},
-        },
-    }
+    output = build_output({"scaleway": scaleway, "aws": aws, "ovh": ovh},
+                          stub.recorded_at if stub else None)
 
-    with open("data/prices.json", "w") as f:
+    with open(out_path, "w") as f:
         json.dump(output, f, indent=2)
-    print(f"\nSaved data/prices.json  (SCW:{len(scaleway)} AWS:{len(aws)} OVH:{len(ovh)})")
+    print(f"\nSaved {out_path}  (SCW:{len(scaleway)} AWS:{len(aws)} OVH:{len(ovh)})")
 
-    # Create baseline only if it does not already exist.
-    # To reset: delete data/prices_baseline.json and re-run.
-    baseline_path = "data/prices_baseline.json"
-    if not os.path.exists(baseline_path):
-        baseline = {**output, "baseline_set_at": output["updated_at"]}
-        with open(baseline_path, "w") as f:
-            json.dump(baseline, f, indent=2)
-        print(f"Created baseline snapshot: {baseline_path}")
+    if stub or out_path != OUTPUT_PATH:
+        print("Baseline untouched (replay / custom output)")
+    elif save_baseline_if_missing(output):
+        print(f"Created baseline snapshot: {BASELINE_PATH}")
         print("  (Delete this file to reset the baseline on next run)")
     else:
-        print(f"Baseline exists: {baseline_path} (not overwritten)")
+        print(f"Baseline exists: {BASELINE_PATH} (not overwritten)")
 
 
 if __name__ == "__main__":
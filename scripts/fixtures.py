@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Record/replay of upstream API responses, so the pipeline can run offline and deterministically.
+
+Layout (one directory per fixture format version):
+  fixtures/v1/index.json        url -> {file, content_encoding, content_type, latency_s, bytes}
+  fixtures/v1/<host>-<hash>.bin raw response body exactly as received (usually gzip)
+
+Recording hooks into fetch_prices.fetch_json. Replay starts a local HTTP stub that serves
+the recorded bodies with their original Content-Encoding and (scaled) latency, so the
+real urllib + gzip path is exercised.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit
+
+FIXTURE_VERSION = 1
+DEFAULT_DIR     = Path("fixtures")
+
+
+def version_dir(root):
+    return Path(root) / f"v{FIXTURE_VERSION}"
+
+
+def fixture_name(url):
+    host = urlsplit(url).hostname or "local"
+    return f"{host}-{hashlib.sha1(url.encode()).hexdigest()[:10]}.bin"
+
+
+def load_index(root):
+    path = version_dir(root) / "index.json"
+    if not path.exists():
+        return {"version": FIXTURE_VERSION, "recorded_at": None, "responses": {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+class Recorder:
+    def __init__(self, root=DEFAULT_DIR):
+        self.dir = version_dir(root)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.index = load_index(root)
+        self.index["recorded_at"] = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        self.lock = threading.Lock()
+
+    def save(self, url, raw, headers, latency_s):
+        name = fixture_name(url)
+        (self.dir / name).write_bytes(raw)
+        with self.lock:
+            self.index["responses"][url] = {
+                "file": name,
+                "content_encoding": headers.get("Content-Encoding"),
+                "content_type": headers.get("Content-Type", "application/json"),
+                "latency_s": round(latency_s, 3),
+                "bytes": len(raw),
+            }
+            with open(self.dir / "index.json", "w") as f:
+                json.dump(self.index, f, indent=2, sort_keys=True)
+
+
+class ReplayStub:
+    """Local HTTP server answering with recorded responses; urls() maps original -> stub URL."""
+
+    def __init__(self, root=DEFAULT_DIR, latency_scale=1.0):
+        self.dir = version_dir(root)
+        self.index = load_index(root)
+        if not self.index["responses"]:
+            raise FileNotFoundError(f"no recorded responses in {self.dir} (run with --record first)")
+        if self.index.get("version") != FIXTURE_VERSION:
+            raise ValueError(f"{self.dir}: fixture version {self.index.get('version')}, expected {FIXTURE_VERSION}")
+        by_file = {e["file"]: e for e in self.index["responses"].values()}
+        fixture_dir = self.dir
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                entry = by_file.get(self.path.lstrip("/"))
+                if not entry:
+                    self.send_error(404)
+                    return
+                time.sleep(entry["latency_s"] * latency_scale)
+                body = (fixture_dir / entry["file"]).read_bytes()
+                self.send_response(200)
+                self.send_header("Content-Type", entry["content_type"])
+                if entry["content_encoding"]:
+                    self.send_header("Content-Encoding", entry["content_encoding"])
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    @property
+    def recorded_at(self):
+        return self.index.get("recorded_at")
+
+    def urls(self):
+        port = self.server.server_address[1]
+        return {url: f"http://127.0.0.1:{port}/{e['file']}" for url, e in self.index["responses"].items()}
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def add_arguments(parser):
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--record", nargs="?", const=DEFAULT_DIR, type=Path, metavar="DIR",
+                       help=f"save raw API responses under DIR/v{FIXTURE_VERSION} (default: {DEFAULT_DIR})")
+    group.add_argument("--replay", nargs="?", const=DEFAULT_DIR, type=Path, metavar="DIR",
+                       help="serve recorded responses from a local stub instead of the live APIs")
+    parser.add_argument("--latency-scale", type=float, default=1.0, metavar="F",
+                        help="multiply recorded latency in --replay mode (0 = no delay)")
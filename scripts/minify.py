@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Small, conservative HTML/CSS/JS minifier (stdlib only) for the dashboard template.
+
+It only removes comments and redundant whitespace; nothing is renamed or rewritten.
+Strings, template literals and regex literals are copied verbatim, and JS newlines are
+kept wherever dropping them could change automatic semicolon insertion.
+
+Usage: python scripts/minify.py < in.html > out.html
+"""
+
+import re
+import sys
+
+# ─── JS ───────────────────────────────────────────────────────────────────────
+_REGEX_AFTER_CHARS = set("(,=:[!&|?{};+-*%~^<>")
+_REGEX_AFTER_WORDS = {"return", "typeof", "case", "do", "else", "in", "instanceof",
+                      "new", "delete", "void", "throw", "yield", "await"}
+_NEWLINE_SAFE_AFTER  = set("{;,([")   # a newline after these never ends a statement
+_NEWLINE_SAFE_BEFORE = set("}),];")   # ...nor one right before these
+
+
+def _is_word(ch):
+    return ch.isalnum() or ch in "_$" or ord(ch) > 127
+
+
+def _skip_string(src, i):
+    """src[i] is a quote; return the index just past the closing quote."""
+    quote, i = src[i], i + 1
+    while i < len(src) and src[i] != quote:
+        i += 2 if src[i] == "\\" else 1
+    return i + 1
+
+
+def _skip_template(src, i):
+    """src[i] is a backtick; return the index past the closing one (handles nested ${...})."""
+    i += 1
+    while i < len(src) and src[i] != "`":
+        if src[i] == "\\":
+            i += 2
+        elif src.startswith("${", i):
+            i = _skip_braced(src, i + 2)
+        else:
+            i += 1
+    return i + 1
+
+
+def _skip_braced(src, i):
+    """Skip JS code up to and including the '}' closing an already opened '{'."""
+    depth = 1
+    while i < len(src) and depth:
+        ch = src[i]
+        if ch in "'\"":
+            i = _skip_string(src, i)
+            continue
+        if ch == "`":
+            i = _skip_template(src, i)
+            continue
+        depth += {"{": 1, "}": -1}.get(ch, 0)
+        i += 1
+    return i
+
+
+def _skip_regex(src, i):
+    """src[i] is the opening '/' of a regex literal; return the index past its flags."""
+    i, in_class = i + 1, False
+    while i < len(src):
+        ch = src[i]
+        if ch == "\\":
+            i += 2
+            continue
+        if ch == "[":
+            in_class = True
+        elif ch == "]":
+            in_class = False
+        elif ch == "/" and not in_class:
+            break
+        i += 1
+    i += 1
+    while i < len(src) and _is_word(src[i]):
+        i += 1
+    return i
+
+
+def minify_js(src):
+    out = []
+    ws = None       # pending whitespace: None, " " or "\n"
+    i, n = 0, len(src)
+
+    def emit(token):
+        nonlocal ws
+        prev = out[-1][-1] if out else ""
+        nxt = token[0]
+        if ws and prev:
+            if ws == "\n" and not (prev in _NEWLINE_SAFE_AFTER or nxt in _NEWLINE_SAFE_BEFORE):
+                out.append("\n")
+            elif (_is_word(prev) and _is_word(nxt)) or (prev in "+-" and nxt in "+-"):
+                out.append(" ")
+        ws = None
+        out.append(token)
+
+    def regex_allowed():
+        if not out:
+            return True
+        tail = "".join(out[-16:]).rstrip()
+        if not tail or tail[-1] in _REGEX_AFTER_CHARS:
+            return True
+        word = re.search(r"[\w$]+$", tail)
+        return bool(word) and word.group() in _REGEX_AFTER_WORDS
+
+    while i < n:
+        ch = src[i]
+        if ch in " \t\r\n":
+            j = i
+            while j < n and src[j] in " \t\r\n":
+                j += 1
+            ws = "\n" if "\n" in src[i:j] or ws == "\n" else " "
+            i = j
+        elif src.startswith("//", i):
+            j = src.find("\n", i)
+            i = n if j < 0 else j
+        elif src.startswith("/*", i):
+            j = src.find("*/", i + 2)
+            j = n if j < 0 else j + 2
+            ws = "\n" if "\n" in src[i:j] or ws == "\n" else (ws or " ")
+            i = j
+        elif ch in "'\"":
+            j = _skip_string(src, i)
+            emit(src[i:j])
+            i = j
+        elif ch == "`":
+            j = _skip_template(src, i)
+            emit(src[i:j])
+            i = j
+        elif ch == "/" and regex_allowed():
+            j = _skip_regex(src, i)
+            emit(src[i:j])
+            i = j
+        else:
+            emit(ch)
+            i += 1
+    return "".join(out)
+
+
+# ─── CSS ──────────────────────────────────────────────────────────────────────
+_CSS_TOKENS = re.compile(r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')|/\*.*?\*/|(\s+)""", re.S)
+_CSS_TIGHT  = re.compile(r"\s*([{};,>])\s*|(:)\s+")
+
+
+def minify_css(src):
+    strings = []
+
+    def stash(m):
+        if m.group(1):
+            strings.append(m.group(1))
+            return f"\x00{len(strings) - 1}\x00"
+        return " " if m.group(2) else ""
+
+    css = _CSS_TOKENS.sub(stash, src)
+    css = _CSS_TIGHT.sub(lambda m: m.group(1) or m.group(2), css)
+    css = css.replace(";}", "}").strip()
+    return re.sub(r"\x00(\d+)\x00", lambda m: strings[int(m.group(1))], css)
+
+
+# ─── HTML ─────────────────────────────────────────────────────────────────────
+_RAW_BLOCKS   = re.compile(r"(<(script|style|pre|textarea)\b([^>]*)>)(.*?)(</\2\s*>)", re.S | re.I)
+_HTML_COMMENT = re.compile(r"<!--(?!\[if).*?-->", re.S)
+
+
+def _minify_text(html):
+    html = _HTML_COMMENT.sub("", html)
+    return re.sub(r"\s+", " ", html)
+
+
+def minify_html(src):
+    parts, pos = [], 0
+    for m in _RAW_BLOCKS.finditer(src):
+        parts.append(_minify_text(src[pos:m.start()]))
+        tag, attrs, body = m.group(2).lower(), m.group(3), m.group(4)
+        if tag == "style":
+            body = minify_css(body)
+        elif tag == "script" and "src=" not in attrs and re.search(r"type=[\"']?(?!text/javascript|module)", attrs) is None:
+            body = minify_js(body)
+        parts.append(m.group(1) + body + m.group(5))
+        pos = m.end()
+    parts.append(_minify_text(src[pos:]))
+    html = "".join(parts).strip()
+    return re.sub(r"> <(?=/?(html|head|body|meta|link|title|style|script|div|header|footer|table|thead|tbody|tr|th|td|select|option)\b)",
+                  "><", html, flags=re.I)
+
+
+if __name__ == "__main__":
+    sys.stdout.write(minify_html(sys.stdin.read()))
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Batch workload -> instance recommender over the normalized catalog in data/prices.json.
+
+Manifest: CSV with a header row, or JSON (a list of objects, or {"workloads": [...]}).
+  name, vcpu, ram_gb       required
+  gpu                      minimum GPU count (default 0)
+  arch                     x86_64 | arm64 | any (default any)
+  count                    number of replicas (default 1)
+
+For every workload the cheapest fitting instance per provider is picked (monthly price),
+plus the cheapest across providers; totals are reported in EUR and USD.
+
+Usage:
+  python scripts/recommend.py workloads.csv [--eur-usd 1.08] [--include-eos] [--output result.json]
+
+Matching uses sorted threshold indexes on vcpu / ram_gb / gpu whose entries are bitsets
+(Python ints, bit i = i-th cheapest instance), so one requirement is a few big-int ANDs
+and the cheapest fit is the lowest set bit.
+"""
+
+import argparse
+import csv
+import json
+import math
+import time
+from bisect import bisect_left
+from pathlib import Path
+
+DATA_FILE = Path("data/prices.json")
+EUR_USD   = 1.08  # assumed exchange rate (USD per EUR); override with --eur-usd
+
+ARCH_ALIASES = {
+    "": "any", "any": "any", "*": "any",
+    "x86_64": "x86_64", "x86": "x86_64", "amd64": "x86_64",
+    "arm64": "arm64", "arm": "arm64", "aarch64": "arm64",
+}
+
+
+def _field(row, field, default=None):
+    """Non-negative finite number from a manifest row; default only when the field is missing or empty."""
+    value = row.get(field)
+    if value is None or value == "":
+        if default is None:
+            raise KeyError(field)
+        return default
+    number = float(value)
+    if not math.isfinite(number) or number < 0:
+        raise ValueError(f"{field} must be a non-negative number, got {value!r}")
+    return number
+
+
+def load_manifest(path):
+    """Read a CSV/JSON workload manifest into a list of normalized requirement dicts."""
+    path = Path(path)
+    with open(path, newline="", encoding="utf-8-sig") as f:  # -sig: Excel CSV exports start with a BOM
+        if path.suffix.lower() == ".json":
+            rows = json.load(f)
+            if isinstance(rows, dict) and "workloads" in rows:
+                rows = rows["workloads"]
+            if not isinstance(rows, list):
+                raise ValueError(f'{path}: expected a list of workloads or {{"workloads": [...]}}')
+        else:
+            rows = list(csv.DictReader(f))
+    workloads = []
+    for n, row in enumerate(rows, start=1):
+        try:
+            if not isinstance(row, dict):
+                raise TypeError(f"expected an object, got {type(row).__name__}")
+            arch = str(row.get("arch") or "").strip().lower()
+            count = _field(row, "count", 1.0)
+            if not count.is_integer():
+                raise ValueError(f"count must be a whole number, got {row['count']!r}")
+            workloads.append({
+                "name":   str(row.get("name") or f"workload-{n}"),
+                "vcpu":   _field(row, "vcpu"),
+                "ram_gb": _field(row, "ram_gb"),
+                "gpu":    math.ceil(_field(row, "gpu", 0)),  # 0.5 GPU still needs a GPU
+                "arch":   ARCH_ALIASES[arch],
+                "count":  int(count),
+            })
+        except (KeyError, ValueError, TypeError) as e:
+            raise ValueError(f"{path}: workload #{n}: invalid or missing field ({e})") from None
+    return workloads
+
+
+class ProviderIndex:
+    """Cheapest-fit lookup for one provider's instances."""
+
+    def __init__(self, key, instances, eur_usd):
+        self.key = key
+        priced = []
+        for inst in instances:
+            if inst.get("monthly_eur") is not None:
+                eur = inst["monthly_eur"]
+                usd = eur * eur_usd
+            elif inst.get("monthly_usd") is not None:
+                usd = inst["monthly_usd"]
+                eur = usd / eur_usd
+            else:
+                continue
+            if eur <= 0:
+                continue  # unpriced catalog entries would always win
+            priced.append((eur, inst["name"], inst, usd))
+        priced.sort(key=lambda p: (p[0], p[1]))
+        self.instances = [
+            {"name": name, "vcpu": inst["vcpu"], "ram_gb": inst["ram_gb"], "gpu": inst.get("gpu", 0),
+             "arch": inst.get("arch", "x86_64"), "monthly_eur": round(eur, 4), "monthly_usd": round(usd, 4)}
+            for eur, name, inst, usd in priced
+        ]
+        self.vcpu = self._threshold_index("vcpu")
+        self.ram  = self._threshold_index("ram_gb")
+        self.gpu  = self._threshold_index("gpu")
+        self.arch = {"any": (1 << len(self.instances)) - 1}
+        for bit, inst in enumerate(self.instances):
+            self.arch[inst["arch"]] = self.arch.get(inst["arch"], 0) | (1 << bit)
+
+    def _threshold_index(self, field):
+        """(sorted distinct values, masks) where masks[k] has every instance with field >= values[k]."""
+        values = sorted({inst[field] for inst in self.instances})
+        exact = dict.fromkeys(values, 0)
+        for bit, inst in enumerate(self.instances):
+            exact[inst[field]] |= 1 << bit
+        masks, acc = [0] * len(values), 0
+        for k in range(len(values) - 1, -1, -1):
+            acc |= exact[values[k]]
+            masks[k] = acc
+        return values, masks
+
+    @staticmethod
+    def _at_least(index, value):
+        values, masks = index
+        k = bisect_left(values, value)
+        return masks[k] if k < len(masks) else 0
+
+    def cheapest(self, vcpu, ram_gb, gpu, arch):
+        fits = (self._at_least(self.vcpu, vcpu) & self._at_least(self.ram, ram_gb)
+                & self._at_least(self.gpu, gpu) & self.arch.get(arch, 0))
+        if not fits:
+            return None
+        return self.instances[(fits & -fits).bit_length() - 1]
+
+
+def build_indexes(data, eur_usd=EUR_USD, include_eos=False):
+    return {
+        key: ProviderIndex(key, [i for i in pdata["instances"] if include_eos or not i.get("end_of_service")], eur_usd)
+        for key, pdata in data["providers"].items()
+    }
+
+
+def recommend(workloads, data, eur_usd=EUR_USD, include_eos=False):
+    """Match every workload against the catalog; returns per-workload picks and fleet totals."""
+    indexes = build_indexes(data, eur_usd, include_eos)
+    memo = {}
+    results = []
+    totals = {key: {"monthly_eur": 0.0, "monthly_usd": 0.0, "unfit": 0} for key in indexes}
+    best_total = {"monthly_eur": 0.0, "monthly_usd": 0.0, "unfit": 0}
+
+    for w in workloads:
+        req = (w["vcpu"], w["ram_gb"], w["gpu"], w["arch"])
+        if req not in memo:
+            memo[req] = {key: idx.cheapest(*req) for key, idx in indexes.items()}
+        picks = memo[req]
+        fitting = [(inst["monthly_eur"], key) for key, inst in picks.items() if inst]
+        best = min(fitting)[1] if fitting else None
+
+        for key, inst in picks.items():
+            if inst:
+                totals[key]["monthly_eur"] += inst["monthly_eur"] * w["count"]
+                totals[key]["monthly_usd"] += inst["monthly_usd"] * w["count"]
+            else:
+                totals[key]["unfit"] += w["count"]
+        if best:
+            best_total["monthly_eur"] += picks[best]["monthly_eur"] * w["count"]
+            best_total["monthly_usd"] += picks[best]["monthly_usd"] * w["count"]
+        else:
+            best_total["unfit"] += w["count"]
+        results.append({**w, "per_provider": picks, "best_provider": best})
+
+    for t in [*totals.values(), best_total]:
+        t["monthly_eur"] = round(t["monthly_eur"], 2)
+        t["monthly_usd"] = round(t["monthly_usd"], 2)
+    return {
+        "catalog_updated_at": data.get("updated_at"),
+        "eur_usd": eur_usd,
+        "workloads": results,
+        "totals": {"per_provider": totals, "best_mix": best_total},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cheapest instance per provider for a workload manifest.")
+    parser.add_argument("manifest", type=Path, help="CSV or JSON workload manifest")
+    parser.add_argument("--eur-usd", type=float, default=EUR_USD, help=f"USD per EUR (default {EUR_USD})")
+    parser.add_argument("--include-eos", action="store_true", help="also consider end-of-service instances")
+    parser.add_argument("--output", type=Path, help="write the full result as JSON")
+    args = parser.parse_args()
+
+    if not DATA_FILE.exists():
+        print(f"ERROR: {DATA_FILE} not found. Run scripts/fetch_prices.py first.")
+        exit(1)
+    try:
+        workloads = load_manifest(args.manifest)
+    except (OSError, ValueError) as e:
+        print(f"ERROR: {e}")
+        exit(1)
+    with open(DATA_FILE) as f:
+        data = json.load(f)
+
+    start = time.perf_counter()
+    result = recommend(workloads, data, args.eur_usd, args.include_eos)
+    elapsed = time.perf_counter() - start
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"Saved {args.output}")
+    replicas = sum(w["count"] for w in workloads)
+    print(f"Matched {len(workloads)} workloads ({replicas} replicas) in {elapsed:.3f}s"
+          f"  (catalog {result['catalog_updated_at']}, 1 EUR = {args.eur_usd} USD)")
+    for key, t in [*result["totals"]["per_provider"].items(), ("best mix", result["totals"]["best_mix"])]:
+        unfit = f"  ({t['unfit']} replicas do not fit)" if t["unfit"] else ""
+        print(f"  {key:<9} €{t['monthly_eur']:>12,.2f}/mo  ${t['monthly_usd']:>12,.2f}/mo{unfit}")
+
+
+if __name__ == "__main__":
+    main()
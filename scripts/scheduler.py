@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Long-running alternative to the daily fetch + build pair.
+Refreshes each provider on its own interval, keeps the normalized data in memory
+and rebuilds the dashboard in-process (no JSON round-trip between fetch and build).
+Outputs: data/prices.json plus everything build_dashboard.py writes, under --out-dir
+         (each file is rewritten only when its content changes)
+Creates: data/prices_baseline.json (same rule as fetch_prices.py; only when writing to the repo root)
+
+Usage:
+  python scripts/scheduler.py [--interval aws=900] [--interval ovh=7200] [--status-port 8765]
+                              [--record [DIR] | --replay [DIR] [--latency-scale F]] [--out-dir DIR]
+
+With --status-port, GET http://127.0.0.1:<port>/status returns the queue and latency state.
+With --replay, updated_at is pinned to the recording time and everything goes to the
+git-ignored replay/ scratch site unless --out-dir says otherwise.
+"""
+
+import argparse
+import heapq
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import build_dashboard
+import fetch_prices
+import fixtures
+
+# Seconds between refreshes; AWS republishes its price list far more often than the others.
+DEFAULT_INTERVALS = {
+    "scaleway": 6 * 3600,
+    "aws":      1 * 3600,
+    "ovh":      6 * 3600,
+}
+RETRY_DELAY = 300  # after a failed fetch, retry sooner than the regular interval
+DATA_FILE   = Path("data/prices.json")
+
+
+class Scheduler:
+    def __init__(self, intervals, pinned_updated_at=None, out_dir=Path(".")):
+        self.intervals = intervals
+        self.out_dir = Path(out_dir)
+        self.data_file = self.out_dir / DATA_FILE
+        self.data_file.parent.mkdir(parents=True, exist_ok=True)
+        self.instances = {}   # provider -> normalized instance list (in-memory source of truth)
+        self.updated_at = None
+        self.pinned_updated_at = pinned_updated_at  # --replay: recording time, for reproducible output
+        self.baseline = build_dashboard.load_baseline()
+        self.queue = []       # heap of (due_monotonic, provider)
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+        self.stats = {
+            key: {
+                "interval_s": intervals[key], "runs": 0, "failures": 0, "changes": 0,
+                "last_fetch_s": None, "avg_fetch_s": None, "last_lag_s": None,
+                "last_run_at": None, "last_error": None, "count": None,
+            }
+            for key in intervals
+        }
+        self.build = {"builds": 0, "failures": 0, "last_build_s": None, "last_error": None,
+                      "last_written": [], "files_written": 0}
+
+    def seed_from_disk(self):
+        """Start from the last saved prices.json so a single refresh can already rebuild."""
+        if not self.data_file.exists():
+            return
+        data = build_dashboard.load_data(self.data_file)
+        self.updated_at = data.get("updated_at")
+        for key, pdata in data.get("providers", {}).items():
+            if key in self.intervals:
+                self.instances[key] = pdata.get("instances", [])
+                self.stats[key]["count"] = len(self.instances[key])
+
+    def schedule(self, key, delay):
+        with self.lock:
+            heapq.heappush(self.queue, (time.monotonic() + delay, key))
+
+    def refresh(self, key, due):
+        stats = self.stats[key]
+        fetch = fetch_prices.PROVIDERS[key][2]
+        start = time.monotonic()
+        stats["last_lag_s"] = round(start - due, 3)
+        try:
+            instances = fetch()
+        except Exception as e:  # network / schema errors must not kill the daemon
+            with self.lock:
+                stats["runs"] += 1
+                stats["failures"] += 1
+                stats["last_error"] = f"{type(e).__name__}: {e}"
+            delay = min(RETRY_DELAY, self.intervals[key])
+            print(f"[{key}] fetch failed: {e} (retry in {delay}s)")
+            return delay
+        elapsed = time.monotonic() - start
+        with self.lock:
+            stats["runs"] += 1
+            ok_runs = stats["runs"] - stats["failures"]
+            prev_avg = stats["avg_fetch_s"] or 0.0
+            stats["avg_fetch_s"] = round(prev_avg + (elapsed - prev_avg) / ok_runs, 3)
+            stats["last_fetch_s"] = round(elapsed, 3)
+            stats["last_run_at"] = fetch_prices.utc_now()
+            stats["last_error"] = None
+            stats["count"] = len(instances)
+            changed = self.instances.get(key) != instances
+            if changed:
+                stats["changes"] += 1
+                self.instances[key] = instances
+                self.updated_at = self.pinned_updated_at or fetch_prices.utc_now()
+        print(f"[{key}] {len(instances)} instance types in {elapsed:.1f}s"
+              f" ({'changed' if changed else 'unchanged'})")
+        if changed or self.build["last_error"]:  # also retry a build that failed earlier
+            self.emit()
+        return self.intervals[key]
+
+    def emit(self):
+        """Rebuild artifacts from memory; files whose content did not change are left alone."""
+        if set(self.instances) != set(fetch_prices.PROVIDERS):
+            return  # wait until every provider has data at least once
+        start = time.monotonic()
+        try:
+            output = fetch_prices.build_output(self.instances, self.updated_at)
+            if self.out_dir == Path(".") and fetch_prices.save_baseline_if_missing(output):
+                print(f"Created baseline snapshot: {fetch_prices.BASELINE_PATH}")
+                self.baseline = build_dashboard.load_baseline()
+            written = []
+            if build_dashboard.write_if_changed(self.data_file, json.dumps(output, indent=2)):
+                written.append(str(self.data_file))
+            written += build_dashboard.write_artifacts(output, self.baseline, self.out_dir)
+        except Exception as e:  # disk / corrupt artifact errors must not kill the daemon either
+            with self.lock:
+                self.build["failures"] += 1
+                self.build["last_error"] = f"{type(e).__name__}: {e}"
+            print(f"  -> build failed: {e} (retried on the next refresh)")
+            return
+        elapsed = time.monotonic() - start
+        with self.lock:
+            self.build["builds"] += 1
+            self.build["last_build_s"] = round(elapsed, 3)
+            self.build["last_error"] = None
+            self.build["last_written"] = written
+            self.build["files_written"] += len(written)
+        print(f"  -> rebuilt in {elapsed:.2f}s, wrote: {', '.join(written) or 'nothing'}")
+
+    def status(self):
+        now = time.monotonic()
+        with self.lock:
+            return {
+                "uptime_s": round(now - self.started, 1),
+                "updated_at": self.updated_at,
+                "queue": [
+                    {"provider": key, "due_in_s": round(due - now, 1)}
+                    for due, key in sorted(self.queue)
+                ],
+                "providers": json.loads(json.dumps(self.stats)),
+                "build": json.loads(json.dumps(self.build)),
+            }
+
+    def run(self):
+        for i, key in enumerate(self.intervals):
+            self.schedule(key, i)  # stagger the first round by a second each
+        while True:
+            with self.lock:
+                due, key = self.queue[0]
+            wait = due - time.monotonic()
+            if wait > 0:
+                time.sleep(min(wait, 60))
+                continue
+            with self.lock:
+                heapq.heappop(self.queue)
+            self.schedule(key, self.refresh(key, due))
+
+
+def serve_status(scheduler, port):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip("/") != "/status":
+                self.send_error(404)
+                return
+            body = json.dumps(scheduler.status(), indent=2).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"Status: http://127.0.0.1:{port}/status")
+
+
+def parse_interval(value):
+    key, _, seconds = value.partition("=")
+    if key not in DEFAULT_INTERVALS or not seconds.isdigit() or int(seconds) <= 0:
+        raise argparse.ArgumentTypeError(
+            f"expected <provider>=<seconds> with provider in {', '.join(DEFAULT_INTERVALS)}")
+    return key, int(seconds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh providers on independent intervals.")
+    parser.add_argument("--interval", action="append", type=parse_interval, default=[],
+                        metavar="PROVIDER=SECONDS", help="override a provider's refresh interval")
+    parser.add_argument("--status-port", type=int, help="serve /status JSON on 127.0.0.1:PORT")
+    parser.add_argument("--out-dir", type=Path,
+                        help=f"site root to write into (default: repo root, {fetch_prices.REPLAY_DIR}/ with --replay)")
+    fixtures.add_arguments(parser)
+    args = parser.parse_args()
+    stub = fetch_prices.setup_fixtures(args)
+
+    intervals = {**DEFAULT_INTERVALS, **dict(args.interval)}
+    out_dir = args.out_dir or Path(fetch_prices.REPLAY_DIR if stub else ".")
+    scheduler = Scheduler(intervals, stub.recorded_at if stub else None, out_dir)
+    scheduler.seed_from_disk()
+    if args.status_port:
+        serve_status(scheduler, args.status_port)
+    print("Intervals: " + ", ".join(f"{k}={v}s" for k, v in intervals.items()) + f"  (writing to {out_dir})")
+    try:
+        scheduler.run()
+    except KeyboardInterrupt:
+        print("\nStopped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+// Service worker for the price dashboard.
+// Serves data/snapshot.json from the last dataset kept in IndexedDB, brought up to date by
+// replaying the daily patches listed in data/manifest.json. Versions are content hashes
+// computed by build_dashboard.py and stored next to the dataset as {version, data}.
+// Falls back to the full snapshot when there is nothing cached yet or the patch chain
+// is broken (pruned, missing, malformed).
+// data/sparklines.json is kept in Cache Storage and only refetched when the manifest's
+// sparklines version changes.
+
+const DB_NAME = 'cloud-price-tracker';
+const STORE   = 'dataset';
+const KEY     = 'snapshot';
+const CACHE   = 'cloud-price-tracker';
+
+const scoped = path => new URL(path, self.registration.scope).href;
+
+self.addEventListener('install',  () => self.skipWaiting());
+self.addEventListener('activate', e  => e.waitUntil(self.clients.claim()));
+
+self.addEventListener('fetch', e => {
+  if (e.request.method !== 'GET') return;
+  const url = e.request.url.split('?')[0];
+  if (url === scoped('data/snapshot.json'))   e.respondWith(dataset());
+  if (url === scoped('data/sparklines.json')) e.respondWith(sparklines());
+});
+
+// One page load asks for the snapshot and the sparklines together: share the manifest fetch.
+let manifestReq = null;
+function loadManifest() {
+  if (!manifestReq) {
+    manifestReq = fetch(scoped('data/manifest.json'), { cache: 'no-cache' }).then(resp => {
+      if (!resp.ok) throw new Error('HTTP ' + resp.status);
+      return resp.json();
+    });
+    setTimeout(() => { manifestReq = null; }, 5000);
+  }
+  return manifestReq;
+}
+
+// ─── IndexedDB ───────────────────────────────────────────────────────────────
+function idb(mode, op) {
+  return new Promise((resolve, reject) => {
+    const open = indexedDB.open(DB_NAME, 1);
+    open.onupgradeneeded = () => open.result.createObjectStore(STORE);
+    open.onerror = () => reject(open.error);
+    open.onsuccess = () => {
+      const db  = open.result;
+      const tx  = db.transaction(STORE, mode);
+      const req = op(tx.objectStore(STORE));
+      tx.oncomplete = () => { db.close(); resolve(req.result); };
+      tx.onerror    = () => { db.close(); reject(tx.error); };
+    };
+  });
+}
+const loadStored = () => idb('readonly',  s => s.get(KEY)).catch(() => undefined);
+const saveStored = d  => idb('readwrite', s => s.put(d, KEY)).catch(() => undefined);
+
+// ─── patching ────────────────────────────────────────────────────────────────
+function applyPatch(data, patch) {
+  for (const [pKey, diff] of Object.entries(patch.providers)) {
+    const p = data.providers[pKey];
+    if (!p) throw new Error('unknown provider ' + pKey);
+    const removed = new Set(diff.removed);
+    const changed = new Map(diff.changed.map(i => [i.name, i]));
+    p.instances = p.instances
+      .filter(i => !removed.has(i.name))
+      .map(i => changed.get(i.name) || i)
+      .concat(diff.added);
+  }
+  data.updated_at = patch.updated_at;
+  return data;
+}
+
+async function replayChain(stored, manifest) {
+  let { version, data } = stored;
+  const start = manifest.patches.findIndex(p => p.from === version);
+  if (start < 0) return null;
+  for (const entry of manifest.patches.slice(start)) {
+    if (entry.from !== version) return null;
+    const resp = await fetch(scoped(entry.file));
+    if (!resp.ok) return null;
+    const patch = await resp.json();
+    if (patch.from !== entry.from || patch.to !== entry.to) return null;
+    data = applyPatch(data, patch);
+    version = patch.to;
+  }
+  return { version, data };
+}
+
+// ─── handler ─────────────────────────────────────────────────────────────────
+const json = data => new Response(JSON.stringify(data), { headers: { 'Content-Type': 'application/json' } });
+
+async function dataset() {
+  const stored = await loadStored();
+  let manifest;
+  try {
+    manifest = await loadManifest();
+  } catch (e) {
+    if (stored && stored.data) return json(stored.data);   // offline: last known dataset beats an error page
+    return fetch(scoped('data/snapshot.json'));
+  }
+
+  let current = stored && stored.version ? stored : null;
+  if (current && current.version !== manifest.latest) {
+    current = await replayChain(structuredClone(current), manifest).catch(() => null);
+  }
+  if (!current || current.version !== manifest.latest) {
+    const resp = await fetch(scoped(manifest.snapshot), { cache: 'no-cache' });
+    if (!resp.ok) return resp;
+    current = { version: manifest.latest, data: await resp.json() };
+  }
+  if (!stored || stored.version !== current.version) await saveStored(current);
+  return json(current.data);
+}
+
+async function sparklines() {
+  const url    = scoped('data/sparklines.json');
+  const cache  = await caches.open(CACHE);
+  const cached = await cache.match(url);
+  let version;
+  try {
+    version = ((await loadManifest()).sparklines || {}).version;
+  } catch (e) {
+    return cached || fetch(url);   // offline
+  }
+  if (cached && version && cached.headers.get('X-Content-Version') === version) return cached;
+  const resp = await fetch(url, { cache: 'no-cache' });
+  if (!resp.ok || !version) return resp;
+  const fresh = new Response(await resp.blob(), {
+    headers: { 'Content-Type': 'application/json', 'X-Content-Version': version },
+  });
+  await cache.put(url, fresh.clone()).catch(() => undefined);
+  return fresh;
+}
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The scripts are run as plain files (python scripts/x.py), not as a package.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
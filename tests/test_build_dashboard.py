@@ -0,0 +1,164 @@
+import base64
+import copy
+import json
+import struct
+from pathlib import Path
+
+import pytest
+
+import build_dashboard as bd
+
+
+def dataset(prices, updated_at="2026-01-01T00:00:00Z"):
+    """prices.json-shaped data with one EUR provider; prices maps instance name -> hourly price."""
+    return {
+        "updated_at": updated_at,
+        "region": "Paris (fr-par)",
+        "providers": {"scaleway": {"name": "Scaleway", "currency": "EUR", "instances": [
+            {"name": name, "hourly_eur": price} for name, price in prices.items()
+        ]}},
+    }
+
+
+def apply_patch(data, patch):
+    """Python port of applyPatch() in sw.js."""
+    for pkey, diff in patch["providers"].items():
+        p = data["providers"][pkey]
+        changed = {i["name"]: i for i in diff["changed"]}
+        p["instances"] = [changed.get(i["name"], i) for i in p["instances"]
+                          if i["name"] not in diff["removed"]] + diff["added"]
+    data["updated_at"] = patch["updated_at"]
+    return data
+
+
+def read(path):
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data").mkdir()
+    snapshots = {}  # version -> snapshot data, for replaying the chain from any point
+
+    def build(data):
+        written = bd.write_artifacts(data, None)
+        snapshots[read(bd.MANIFEST_FILE)["latest"]] = read(bd.SNAPSHOT_FILE)
+        return written
+    build.snapshots = snapshots
+    return build
+
+
+def assert_chain_walkable(snapshots):
+    """Every listed `from` must reach `latest` through the listed patches and reproduce the snapshot."""
+    manifest = read(bd.MANIFEST_FILE)
+    patches = manifest["patches"]
+    assert sorted(p.name for p in bd.PATCH_DIR.glob("*.json")) == sorted(Path(e["file"]).name for e in patches)
+    for start, entry in enumerate(patches):
+        version, data = entry["from"], copy.deepcopy(snapshots[entry["from"]])
+        for e in patches[start:]:
+            assert e["from"] == version
+            patch = read(e["file"])
+            assert (patch["from"], patch["to"]) == (e["from"], e["to"])
+            data, version = apply_patch(data, patch), patch["to"]
+        assert version == manifest["latest"]
+        assert data == read(bd.SNAPSHOT_FILE)
+
+
+def test_first_build_has_no_patches(site):
+    site(dataset({"a": 1.0}))
+    manifest = read(bd.MANIFEST_FILE)
+    assert manifest["patches"] == []
+    assert manifest["latest"] == bd.content_version(bd.SNAPSHOT_FILE.read_text(encoding="utf-8"))
+
+
+def test_diff_patch(site):
+    site(dataset({"a": 1.0, "b": 2.0, "c": 3.0}))
+    site(dataset({"a": 1.5, "c": 3.0, "d": 4.0}, "2026-01-02T00:00:00Z"))
+    entry, = read(bd.MANIFEST_FILE)["patches"]
+    patch = read(entry["file"])
+    assert patch["providers"]["scaleway"] == {
+        "added":   [{"name": "d", "hourly_eur": 4.0}],
+        "removed": ["b"],
+        "changed": [{"name": "a", "hourly_eur": 1.5}],
+    }
+    assert patch["updated_at"] == "2026-01-02T00:00:00Z"
+    assert_chain_walkable(site.snapshots)
+
+
+def test_content_change_without_new_date(site):
+    site(dataset({"a": 1.0}))
+    site(dataset({"a": 2.0}))
+    assert len(read(bd.MANIFEST_FILE)["patches"]) == 1
+    assert_chain_walkable(site.snapshots)
+
+
+def test_unchanged_content_writes_no_patch(site):
+    site(dataset({"a": 1.0}))
+    site(dataset({"a": 2.0}))
+    written = site(dataset({"a": 2.0}))
+    assert written == []
+    assert len(read(bd.MANIFEST_FILE)["patches"]) == 1
+
+
+def test_cycle_keeps_chain_walkable(site):
+    a, b, c = dataset({"x": 1.0}), dataset({"x": 2.0}), dataset({"x": 3.0})
+    for data in (a, b, a, b, c, b):
+        site(data)
+        assert_chain_walkable(site.snapshots)
+    manifest = read(bd.MANIFEST_FILE)
+    assert [e["to"] for e in manifest["patches"]].count(manifest["latest"]) == 1
+
+
+def test_prunes_to_max_patches(site):
+    for n in range(bd.MAX_PATCHES + 5):
+        site(dataset({"a": float(n)}))
+    assert len(read(bd.MANIFEST_FILE)["patches"]) == bd.MAX_PATCHES
+    assert len(list(bd.PATCH_DIR.glob("*.json"))) == bd.MAX_PATCHES
+    assert_chain_walkable(site.snapshots)
+
+
+def test_same_date_replaces_last_column():
+    history = {"dates": [], "series": {}}
+    bd.update_history(history, dataset({"a": 1.0}, "2026-01-01T00:00:00Z"))
+    bd.update_history(history, dataset({"a": 2.0, "b": 5.0}, "2026-01-02T00:00:00Z"))
+    bd.update_history(history, dataset({"a": 3.0, "c": 7.0}, "2026-01-02T00:00:00Z"))
+    assert history == {
+        "dates": ["2026-01-01T00:00:00Z", "2026-01-02T00:00:00Z"],
+        "series": {"scaleway|a": [1.0, 3.0], "scaleway|c": [None, 7.0]},
+    }
+
+
+def test_lttb_keeps_shape():
+    points = [(x, (x * 37) % 11) for x in range(500)]
+    sampled = bd.lttb(points, 32)
+    assert len(sampled) == 32
+    assert sampled[0] == points[0] and sampled[-1] == points[-1]
+    assert all(a[0] < b[0] for a, b in zip(sampled, sampled[1:]))
+    assert bd.lttb(points[:10], 32) == points[:10]
+
+
+def unpack(text):
+    s = json.loads(text)
+    n = len(s["keys"])
+    values, xs = base64.b64decode(s["values"]), base64.b64decode(s["xs"])
+    ranges = struct.unpack(f"<{2 * n}f", base64.b64decode(s["ranges"]))
+    return s, values, xs, ranges
+
+
+def test_sparkline_layout():
+    history = {"dates": [], "series": {}}
+    for day, prices in enumerate([{"a": 1.0, "gone": 9.0}, {"a": 2.0, "b": 4.0}, {"a": 1.5, "b": 4.0}], start=1):
+        bd.update_history(history, dataset(prices, f"2026-01-0{day}T00:00:00Z"))
+    s, values, xs, ranges = unpack(bd.build_sparklines(history, {"scaleway|a", "scaleway|b"}))
+
+    assert s["keys"] == ["scaleway|a", "scaleway|b"]   # "gone" is no longer in the catalog
+    p = s["points"]
+    assert p == bd.SPARK_POINTS
+    assert len(values) == len(xs) == 2 * p
+    pad = bytes([bd.SPARK_MISSING] * (p - 3))
+    assert values[:p] == pad + bytes([0, 254, 127])                # scaled to the series' min..max
+    assert xs[:p] == pad + bytes([0, 127, 254])                    # position on the shared time axis
+    assert values[p:] == bytes([bd.SPARK_MISSING] * (p - 2)) + bytes([127, 127])   # flat series
+    assert xs[p:].endswith(bytes([127, 254]))
+    assert ranges == (1.0, 2.0, 4.0, 4.0)
@@ -0,0 +1,90 @@
+import gzip
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+import build_dashboard
+import fetch_prices
+import fixtures
+
+RESPONSES = {
+    fetch_prices.SCALEWAY_URL: {"servers": {
+        "DEV1-S":  {"ncpus": 2, "ram": 2 * 1024 ** 3, "hourly_price": 0.0099, "monthly_price": 7.23},
+        "COPARM1": {"ncpus": 4, "ram": 16 * 1024 ** 3, "hourly_price": 0.11, "monthly_price": 80.3,
+                    "arch": "arm64", "end_of_service": True},
+    }},
+    fetch_prices.AWS_URL: {"regions": {"EU (Paris)": {
+        "a": {"Instance Type": "m7g.large", "vCPU": "2", "Memory": "8 GiB", "price": "0.0952"},
+        "b": {"Instance Type": "t3.micro", "vCPU": "2", "Memory": "1 GiB", "price": "0.0118"},
+        "c": {"Instance Type": "t3.micro", "vCPU": "2", "Memory": "1 GiB", "price": "0.5"},
+    }}},
+    fetch_prices.OVH_URL: {
+        "plans": [{"addonFamilies": [{"name": "instance", "addons": ["b3-8.consumption", "b3-8.monthly"]}]}],
+        "addons": [
+            {"planCode": "b3-8.consumption", "invoiceName": "b3-8",
+             "blobs": {"technical": {"cpu": {"cores": 2}, "memory": {"size": 8192}}},
+             "pricings": [{"capacities": ["consumption"], "price": 5_000_000}]},
+            {"planCode": "b3-8.monthly", "invoiceName": "b3-8 monthly", "pricings": []},
+        ],
+    },
+}
+
+
+@pytest.fixture
+def recorded(tmp_path):
+    recorder = fixtures.Recorder(tmp_path / "fixtures")
+    for url, body in RESPONSES.items():
+        recorder.save(url, gzip.compress(json.dumps(body).encode()),
+                      {"Content-Encoding": "gzip", "Content-Type": "application/json"}, 0.25)
+    return tmp_path / "fixtures"
+
+
+def test_replay_through_fetchers(recorded, monkeypatch):
+    stub = fixtures.ReplayStub(recorded, latency_scale=0)
+    try:
+        monkeypatch.setattr(fetch_prices, "REPLAY", stub.urls())
+        scaleway, aws, ovh = fetch_prices.fetch_scaleway(), fetch_prices.fetch_aws(), fetch_prices.fetch_ovh()
+    finally:
+        stub.close()
+
+    assert [(i["name"], i["ram_gb"], i["arch"], i["end_of_service"]) for i in scaleway] == [
+        ("DEV1-S", 2.0, "x86_64", False), ("COPARM1", 16.0, "arm64", True)]
+    assert [(i["name"], i["arch"], i["hourly_usd"], i["monthly_usd"]) for i in aws] == [
+        ("t3.micro", "x86_64", 0.0118, 8.614), ("m7g.large", "arm64", 0.0952, 69.496)]
+    assert [(i["name"], i["vcpu"], i["ram_gb"], i["hourly_eur"]) for i in ovh] == [("b3-8", 2, 8.0, 0.05)]
+
+
+def test_unrecorded_url_fails(monkeypatch):
+    monkeypatch.setattr(fetch_prices, "REPLAY", {})
+    with pytest.raises(KeyError):
+        fetch_prices.fetch_aws()
+
+
+def run_pipeline(fixture_dir, monkeypatch):
+    monkeypatch.setattr(fetch_prices, "REPLAY", None)
+    monkeypatch.setattr(sys, "argv", ["fetch_prices.py", "--replay", str(fixture_dir), "--latency-scale", "0"])
+    fetch_prices.main()
+    monkeypatch.setattr(sys, "argv", ["build_dashboard.py", "--data", fetch_prices.REPLAY_OUTPUT,
+                                      "--out-dir", fetch_prices.REPLAY_DIR])
+    build_dashboard.main()
+
+
+def test_replay_pipeline_is_offline_and_reproducible(recorded, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    run_pipeline(recorded, monkeypatch)
+    site = tmp_path / fetch_prices.REPLAY_DIR
+    first = {p.relative_to(site): p.read_bytes() for p in site.rglob("*") if p.is_file()}
+
+    for p in site.rglob("*.json"):
+        p.unlink()
+    run_pipeline(recorded, monkeypatch)
+    second = {p.relative_to(site): p.read_bytes() for p in site.rglob("*") if p.is_file()}
+
+    assert first == second
+    assert {"index.html", "sw.js", "data/prices.json", "data/snapshot.json",
+            "data/sparklines.json"} <= {p.as_posix() for p in first}
+    prices = json.loads(first[Path("data/prices.json")])
+    assert prices["updated_at"] == fixtures.load_index(recorded)["recorded_at"]
+    assert not (tmp_path / "data").exists()   # tracked outputs and baseline untouched
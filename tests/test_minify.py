@@ -0,0 +1,59 @@
+import re
+import shutil
+import subprocess
+
+import pytest
+
+import build_dashboard
+import minify
+
+
+def test_js_regex_vs_division():
+    assert minify.minify_js("let a = b\n/ 2;") == "let a=b\n/2;"
+    assert minify.minify_js("x = y / z / 2") == "x=y/z/2"
+    assert minify.minify_js("const r = /a b\\/[/]c/g.test(s)") == "const r=/a b\\/[/]c/g.test(s)"
+    assert minify.minify_js("return /x  y/.test(s)") == "return/x  y/.test(s)"
+
+
+def test_js_asi_sensitive_newlines_are_kept():
+    assert minify.minify_js("a = b\n(c)") == "a=b\n(c)"
+    assert minify.minify_js("x++\n+y") == "x++\n+y"
+    assert minify.minify_js("return\nvalue") == "return\nvalue"
+    # ...but dropped where no statement can end
+    assert minify.minify_js("f(a,\n  b);\n{\n  c()\n}") == "f(a,b);{c()}"
+
+
+def test_js_keeps_token_boundaries():
+    assert minify.minify_js("a = b + +c; d = e - -f") == "a=b+ +c;d=e- -f"
+    assert minify.minify_js("let  x = typeof  y") == "let x=typeof y"
+
+
+def test_js_template_literals_verbatim():
+    src = "const s = `a  ${ {k: `n${ q }`}.k + '}' }  b` // tail\nf()"
+    assert minify.minify_js(src) == "const s=`a  ${ {k: `n${ q }`}.k + '}' }  b`\nf()"
+
+
+def test_js_strings_and_comments():
+    src = "let u = 'http://x' /* c */ + \"a // b\"; // end\n/* multi\nline */ g()"
+    assert minify.minify_js(src) == "let u='http://x'+\"a // b\";g()"
+
+
+def test_css_strings_and_comments():
+    # whitespace before ':' is kept on purpose ("a :hover" != "a:hover")
+    src = "/* hdr */ a :hover { font-family:  'A  B', x ; content: \"/* no */\" ; }\n.b > .c , .d { m: 0 4px ; }"
+    assert minify.minify_css(src) == "a :hover{font-family:'A  B',x;content:\"/* no */\"}.b>.c,.d{m:0 4px}"
+
+
+def test_html_minifies_blocks_and_text():
+    src = "<html>\n <!-- c -->\n <style> a { b: c } </style>\n<body> <span>a</span> <span>b</span>\n<script>\n let a = 1 // x\n</script></body></html>"
+    assert minify.minify_html(src) == "<html><style>a{b:c}</style><body> <span>a</span> <span>b</span><script>let a=1</script></body></html>"
+
+
+@pytest.mark.skipif(not shutil.which("node"), reason="node not installed")
+def test_compiled_dashboard_script_parses(tmp_path):
+    html = build_dashboard.build_html(None)
+    script = re.search(r"<script>(.*)</script>", html, re.S).group(1)
+    path = tmp_path / "page.js"
+    path.write_text(script, encoding="utf-8")
+    subprocess.run(["node", "--check", str(path)], check=True)
+
@@ -0,0 +1,115 @@
+import json
+import random
+
+import pytest
+
+import recommend
+
+CATALOG = {
+    "updated_at": "2026-01-01T00:00:00Z",
+    "providers": {
+        "scaleway": {"instances": [
+            {"name": "S-2",   "vcpu": 2, "ram_gb": 4,  "gpu": 0, "arch": "x86_64", "monthly_eur": 10.0},
+            {"name": "S-A2",  "vcpu": 2, "ram_gb": 8,  "gpu": 0, "arch": "arm64",  "monthly_eur": 8.0},
+            {"name": "S-GPU", "vcpu": 8, "ram_gb": 48, "gpu": 1, "arch": "x86_64", "monthly_eur": 500.0},
+            {"name": "S-EOS", "vcpu": 4, "ram_gb": 16, "gpu": 0, "arch": "x86_64", "monthly_eur": 1.0,
+             "end_of_service": True},
+        ]},
+        "aws": {"instances": [
+            {"name": "t.small", "vcpu": 2, "ram_gb": 2, "gpu": 0, "arch": "x86_64", "monthly_usd": 5.4},
+            {"name": "m.large", "vcpu": 4, "ram_gb": 16, "gpu": 0, "arch": "x86_64", "monthly_usd": 54.0},
+            {"name": "free",    "vcpu": 64, "ram_gb": 512, "gpu": 8, "arch": "x86_64", "monthly_usd": 0.0},
+        ]},
+    },
+}
+
+ROWS = [
+    {"name": "web", "vcpu": 2, "ram_gb": 4, "gpu": "", "arch": "", "count": 3},
+    {"name": "idle", "vcpu": 1, "ram_gb": 1, "gpu": 0, "arch": "x86", "count": 0},
+    {"name": "ml", "vcpu": 4, "ram_gb": 16, "gpu": 0.5, "arch": "any", "count": ""},
+]
+
+
+def write_manifest(tmp_path, rows, suffix):
+    path = tmp_path / f"workloads{suffix}"
+    if suffix == ".json":
+        path.write_text(json.dumps(rows))
+    else:
+        lines = ["name,vcpu,ram_gb,gpu,arch,count"] + [",".join(str(r[k]) for k in
+                 ("name", "vcpu", "ram_gb", "gpu", "arch", "count")) for r in rows]
+        path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+def test_csv_and_json_manifests_agree(tmp_path):
+    csv_rows = recommend.load_manifest(write_manifest(tmp_path, ROWS, ".csv"))
+    json_rows = recommend.load_manifest(write_manifest(tmp_path, ROWS, ".json"))
+    assert csv_rows == json_rows
+    assert [w["count"] for w in json_rows] == [3, 0, 1]    # 0 stays 0, empty defaults to 1
+    assert [w["gpu"] for w in json_rows] == [0, 0, 1]      # fractional GPU rounds up
+    assert [w["arch"] for w in json_rows] == ["any", "x86_64", "any"]
+
+
+@pytest.mark.parametrize("field, value", [
+    ("count", -3), ("vcpu", -1), ("ram_gb", "-2"), ("gpu", -1), ("count", 1.5), ("vcpu", "nan"), ("vcpu", ""),
+])
+def test_invalid_rows_are_rejected(tmp_path, field, value):
+    row = {"name": "x", "vcpu": 1, "ram_gb": 1, "gpu": 0, "arch": "", "count": 1, field: value}
+    with pytest.raises(ValueError, match="workload #1"):
+        recommend.load_manifest(write_manifest(tmp_path, [row], ".json"))
+
+
+def test_csv_with_bom(tmp_path):
+    path = write_manifest(tmp_path, ROWS, ".csv")
+    path.write_bytes(b"\xef\xbb\xbf" + path.read_bytes())   # Excel "CSV UTF-8" export
+    assert [w["name"] for w in recommend.load_manifest(path)] == ["web", "idle", "ml"]
+
+
+@pytest.mark.parametrize("manifest, match", [
+    ([1, 2], "workload #1"),
+    ({"workloads": [{"name": "a", "vcpu": 1, "ram_gb": 1}, "b"]}, "workload #2"),
+    ({"jobs": []}, "expected a list"),
+    ("web", "expected a list"),
+])
+def test_malformed_json_manifest(tmp_path, manifest, match):
+    path = tmp_path / "workloads.json"
+    path.write_text(json.dumps(manifest))
+    with pytest.raises(ValueError, match=match):
+        recommend.load_manifest(path)
+
+
+def test_cheapest_fit_and_totals(tmp_path):
+    workloads = recommend.load_manifest(write_manifest(tmp_path, ROWS, ".json"))
+    result = recommend.recommend(workloads, CATALOG, eur_usd=1.08)
+    web, idle, ml = result["workloads"]
+
+    assert web["per_provider"]["scaleway"]["name"] == "S-A2"   # any arch: cheaper ARM wins
+    assert web["per_provider"]["aws"]["name"] == "m.large"     # t.small lacks RAM
+    assert web["best_provider"] == "scaleway"
+    assert idle["per_provider"]["scaleway"]["name"] == "S-2"   # x86 only; EOS excluded
+    assert ml["per_provider"]["scaleway"]["name"] == "S-GPU"
+    assert ml["per_provider"]["aws"] is None                   # the unpriced GPU box is skipped
+
+    totals = result["totals"]
+    assert totals["per_provider"]["scaleway"]["monthly_eur"] == 3 * 8.0 + 500.0
+    assert totals["per_provider"]["aws"]["unfit"] == 1
+    assert totals["best_mix"]["monthly_eur"] == 524.0
+    assert totals["best_mix"]["monthly_usd"] == round(524.0 * 1.08, 2)
+
+
+def test_matches_brute_force_scan():
+    rng = random.Random(7)
+    data = {"providers": {"p": {"instances": [
+        {"name": f"i{n}", "vcpu": rng.choice([1, 2, 4, 8, 16, 32]), "ram_gb": rng.choice([1, 2, 4, 8, 16, 64]),
+         "gpu": rng.choice([0, 0, 0, 1, 2]), "arch": rng.choice(["x86_64", "arm64"]),
+         "monthly_eur": round(rng.uniform(1, 500), 2)}
+        for n in range(200)
+    ]}}}
+    index = recommend.build_indexes(data)["p"]
+    for _ in range(500):
+        req = (rng.choice([0.5, 1, 3, 8, 20, 40]), rng.choice([0.5, 3, 8, 30, 100]),
+               rng.choice([0, 1, 3]), rng.choice(["any", "x86_64", "arm64"]))
+        fits = [i for i in index.instances if i["vcpu"] >= req[0] and i["ram_gb"] >= req[1]
+                and i["gpu"] >= req[2] and req[3] in ("any", i["arch"])]
+        expected = min(fits, key=lambda i: (i["monthly_eur"], i["name"])) if fits else None
+        assert index.cheapest(*req) == expected
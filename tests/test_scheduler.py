@@ -0,0 +1,101 @@
+import pytest
+
+import build_dashboard
+import fetch_prices
+import scheduler
+
+INTERVALS = {"alpha": 60, "beta": 120}
+
+
+def instance(name, price):
+    return {"name": name, "vcpu": 2, "ram_gb": 4, "gpu": 0, "arch": "x86_64",
+            "hourly_usd": None, "hourly_eur": price, "monthly_eur": round(price * 730, 4),
+            "monthly_usd": None, "currency": "EUR", "end_of_service": False}
+
+
+@pytest.fixture
+def catalog(tmp_path, monkeypatch):
+    """Fake providers whose fetch returns whatever the test puts in the dict."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data").mkdir()
+    current = {"alpha": [instance("a-1", 0.01)], "beta": [instance("b-1", 0.02)]}
+    monkeypatch.setattr(fetch_prices, "PROVIDERS", {
+        key: (key.title(), "EUR", lambda key=key: list(current[key])) for key in INTERVALS
+    })
+    return current
+
+
+def test_emits_only_on_change(catalog, monkeypatch):
+    calls = []
+    real = build_dashboard.write_artifacts
+    monkeypatch.setattr(build_dashboard, "write_artifacts", lambda *a: calls.append(a) or real(*a))
+    s = scheduler.Scheduler(INTERVALS, pinned_updated_at="2026-01-01T00:00:00Z")
+
+    assert s.refresh("alpha", 0) == 60
+    assert calls == []  # beta has no data yet
+    assert s.refresh("beta", 0) == 120
+    assert len(calls) == 1
+    assert "index.html" in s.status()["build"]["last_written"]
+
+    s.refresh("alpha", 0)
+    assert len(calls) == 1
+
+    catalog["alpha"] = [instance("a-1", 0.015)]
+    s.refresh("alpha", 0)
+    assert len(calls) == 2
+    assert s.stats["alpha"]["changes"] == 2
+
+
+def test_failed_fetch_retries_sooner(catalog):
+    def boom():
+        raise OSError("network down")
+    fetch_prices.PROVIDERS["beta"] = ("Beta", "EUR", boom)
+    s = scheduler.Scheduler(INTERVALS)
+    assert s.refresh("beta", 0) == min(scheduler.RETRY_DELAY, INTERVALS["beta"])
+    assert s.stats["beta"]["failures"] == 1
+    assert s.stats["beta"]["last_error"] == "OSError: network down"
+
+
+def test_build_failure_keeps_schedule(catalog, monkeypatch):
+    disk_full = [True]
+    real = build_dashboard.write_artifacts
+
+    def flaky(*a):
+        if disk_full[0]:
+            raise OSError("disk full")
+        return real(*a)
+    monkeypatch.setattr(build_dashboard, "write_artifacts", flaky)
+    s = scheduler.Scheduler(INTERVALS)
+    s.refresh("alpha", 0)
+    assert s.refresh("beta", 0) == 120
+    assert s.build["failures"] == 1
+    assert s.build["last_error"] == "OSError: disk full"
+
+    # The next refresh retries the build even though its own data did not change.
+    disk_full[0] = False
+    s.refresh("alpha", 0)
+    assert s.build["builds"] == 1
+    assert s.build["last_error"] is None
+
+
+def test_status_shape(catalog):
+    s = scheduler.Scheduler(INTERVALS)
+    s.schedule("alpha", 30)
+    status = s.status()
+    assert set(status) == {"uptime_s", "updated_at", "queue", "providers", "build"}
+    assert status["queue"][0]["provider"] == "alpha"
+    assert set(status["providers"]) == set(INTERVALS)
+    assert set(status["providers"]["alpha"]) == {
+        "interval_s", "runs", "failures", "changes", "last_fetch_s", "avg_fetch_s",
+        "last_lag_s", "last_run_at", "last_error", "count"}
+    assert set(status["build"]) == {
+        "builds", "failures", "last_build_s", "last_error", "last_written", "files_written"}
+
+
+def test_out_dir_leaves_repo_root_alone(catalog, tmp_path):
+    s = scheduler.Scheduler(INTERVALS, "2026-01-01T00:00:00Z", out_dir="replay")
+    s.refresh("alpha", 0)
+    s.refresh("beta", 0)
+    assert (tmp_path / "replay" / "data" / "prices.json").exists()
+    assert (tmp_path / "replay" / "index.html").exists()
+    assert sorted(p.name for p in (tmp_path / "data").iterdir()) == []   # no prices.json, no baseline